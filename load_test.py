@@ -0,0 +1,414 @@
+"""Concurrent-user load test for the Audit Tools Streamlit app.
+
+Drives scripted sessions through login, dashboard, tools, TDS extraction,
+save, projects, saved results and analytics using Streamlit's AppTest, many
+sessions at once against one shared SQLite database. AppTest swaps a
+process-wide runtime on every run, so each concurrent session gets its own
+worker process. Records per-page rerun latency, time spent in SQLite calls,
+time spent waiting on SQLite locks, lock errors and memory growth per
+session, and writes a JSON report that can be compared with an earlier run.
+
+    python load_test.py --concurrency 20 --sessions 40 --report after.json
+    python load_test.py --concurrency 20 --compare before.json
+
+The run uses a scratch database in a new temporary directory, or in
+--workdir, which must not be the app directory or already hold an
+audit_tools.db, so the real database is never touched.
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app.py')
+PAGES = ['login', 'dashboard', 'tools', 'extraction', 'save', 'projects', 'results', 'analytics']
+PASSWORD = 'loadtest123'
+
+# SQLite instrumentation
+#
+# The app opens a new connection per query with sqlite3.connect. In each
+# worker, connections are swapped for a subclass whose cursors time every
+# statement and commit against the page currently being driven. SQLite's
+# own busy handler would hide lock waits inside the call time, so
+# connections get a short busy timeout instead and a locked call is retried
+# here, with the time spent on failed attempts counted as lock wait, until
+# the timeout the app asked for (sqlite3's default of 5s) runs out.
+LOCK_POLL_SECONDS = 0.05
+_current_page = {'page': None}
+_db_stats = {}
+_real_connect = sqlite3.connect
+_sessions_in_worker = {'count': 0}
+
+def _record_db(elapsed, lock_wait, locked):
+    if _current_page['page'] is None:
+        return
+    stats = _db_stats.setdefault(_current_page['page'], {'db_seconds': 0.0, 'db_calls': 0, 'lock_wait_seconds': 0.0, 'lock_errors': 0})
+    stats['db_seconds'] += elapsed
+    stats['db_calls'] += 1
+    stats['lock_wait_seconds'] += lock_wait
+    stats['lock_errors'] += int(locked)
+
+def _timed(connection, call, *args):
+    started = time.perf_counter()
+    lock_wait = 0.0
+    while True:
+        attempt = time.perf_counter()
+        try:
+            result = call(*args)
+        except sqlite3.OperationalError as e:
+            locked = 'locked' in str(e)
+            if locked:
+                lock_wait += time.perf_counter() - attempt
+            if not locked or lock_wait >= connection.lock_timeout:
+                _record_db(time.perf_counter() - started, lock_wait, locked)
+                raise
+            continue
+        _record_db(time.perf_counter() - started, lock_wait, False)
+        return result
+
+class TimedCursor(sqlite3.Cursor):
+    def execute(self, *args):
+        return _timed(self.connection, super().execute, *args)
+
+    def executemany(self, *args):
+        return _timed(self.connection, super().executemany, *args)
+
+class TimedConnection(sqlite3.Connection):
+    lock_timeout = 5.0
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def commit(self):
+        return _timed(self, super().commit)
+
+def _timed_connect(*args, timeout=5.0, **kwargs):
+    kwargs.setdefault('factory', TimedConnection)
+    connection = _real_connect(*args, timeout=LOCK_POLL_SECONDS, **kwargs)
+    connection.lock_timeout = timeout
+    return connection
+
+@contextmanager
+def harness_main():
+    # AppTest leaves the app script registered as __main__, which breaks
+    # unpickling of the next task sent to the same worker
+    main_module = sys.modules['__main__']
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = main_module
+
+# Memory helpers
+#
+# Current RSS comes from psutil or /proc. Without either, the only portable
+# figure is the peak RSS from getrusage, and the report says so.
+RSS_KIND = 'current' if psutil or os.path.exists('/proc/self/status') else 'peak'
+
+def rss_mb():
+    if psutil:
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+def session_state_mb(at):
+    size = 0
+    for key, value in at.session_state.items():
+        try:
+            size += len(pickle.dumps(value))
+        except Exception:
+            pass
+    return size / 1024 / 1024
+
+# Scenario
+def synthetic_challans(count, rng):
+    """Rows shaped like parse_challan_data output, as the Process button stores them."""
+    rows = []
+    for i in range(count):
+        tax = rng.randint(1000, 500000)
+        rows.append({
+            'date_of_deposit': f"{rng.randint(1, 28):02d}-{rng.choice(['Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep'])}-2024",
+            'bsr_code': f"{rng.randint(0, 9999999):07d}",
+            'challan_no': f"{rng.randint(0, 99999):05d}",
+            'nature_of_payment': rng.choice(['94C', '94J', '94I', '92B']),
+            'amount': str(tax),
+            'tax': str(tax),
+            'surcharge': '0',
+            'cess': '0',
+            'interest': str(rng.randint(0, 500)),
+            'penalty': '0',
+            'fee_234e': '0',
+            'tan': rng.choice(['ABCD12345E', 'WXYZ54321A', 'PQRS67890K']),
+            'assessment_year': '2025-26',
+            'file_name': f"challan_{i}.pdf",
+        })
+    return rows
+
+def run_session(session_id, email, args):
+    """Run one scripted user session in a worker process.
+
+    Returns (per-page timings, per-page SQLite stats, memory figures).
+    Worker processes are reused once --sessions exceeds --concurrency, and
+    the first session in a worker also pays for importing the app, so the
+    memory figures say which kind of session they came from.
+    """
+    sqlite3.connect = _timed_connect
+    _db_stats.clear()
+    _sessions_in_worker['count'] += 1
+    rss_before = rss_mb()
+
+    rng = random.Random(session_id)
+    timings = []
+    at = AppTest.from_file(APP_FILE, default_timeout=args.timeout)
+
+    def step(page, action):
+        _current_page['page'] = page
+        started = time.perf_counter()
+        error = ''
+        try:
+            action()
+            if at.exception:
+                error = at.exception[0].message
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        timings.append({'session': session_id, 'page': page, 'seconds': time.perf_counter() - started, 'error': error})
+        return not error
+
+    def login():
+        at.run()
+        at.text_input[0].input(email)
+        at.text_input[1].input(PASSWORD)
+        next(b for b in at.button if b.label == 'Sign In').click().run()
+        if at.session_state['user_id'] is None:
+            raise RuntimeError("login failed")
+
+    def open_extractor():
+        tool_button = next(b for b in at.button if b.label.endswith('TDS Challan Extractor'))
+        tool_button.click().run()
+        # AppTest cannot upload files, so inject results the way "Process Challans" stores them
+        rows = synthetic_challans(args.challans, rng)
+        frame = pd.DataFrame(rows)
+        for column in ['amount', 'tax', 'surcharge', 'cess', 'interest', 'penalty', 'fee_234e']:
+            frame[column] = pd.to_numeric(frame[column])
+        at.session_state['tds_results'] = rows
+        at.session_state['tds_results_frame'] = frame
+        at.session_state['tds_file_count'] = len(rows)
+        at.run()
+
+    def save():
+        next(b for b in at.button if b.label == '💾 Save to Projects').click().run()
+        if not any('Saved to projects' in s.value for s in at.success):
+            raise RuntimeError("project was not saved")
+
+    def view_results():
+        # Open the newest saved project, then sort it and turn a page so
+        # decoding, the memoised view and paging all run
+        view_button = next(b for b in at.button if b.key and b.key.startswith('view_'))
+        view_button.click().run()
+        key = f"project_{view_button.key[len('view_'):]}"
+        at.selectbox(key=f"{key}_sort").select('tax').run()
+        at.selectbox(key=f"{key}_order").select('Descending').run()
+        at.number_input(key=f"{key}_page").increment().run()
+
+    def navigate(page):
+        def action():
+            if 'selected_tool' in at.session_state:
+                # Tool pages have no sidebar, so leave them the way the back button does
+                del at.session_state['selected_tool']
+                at.session_state['page'] = page
+                at.run()
+            else:
+                at.button(key=f"nav_{page}").click().run()
+        return action
+
+    with harness_main():
+        if step('login', login):
+            for _ in range(args.iterations):
+                step('dashboard', navigate('dashboard'))
+                step('tools', navigate('tools'))
+                if step('extraction', open_extractor):
+                    step('save', save)
+                if step('projects', navigate('projects')):
+                    step('results', view_results)
+                step('analytics', navigate('analytics'))
+    _current_page['page'] = None
+
+    memory = {'rss_growth_mb': rss_mb() - rss_before, 'session_state_mb': session_state_mb(at),
+              'first_in_worker': _sessions_in_worker['count'] == 1}
+    return timings, dict(_db_stats), memory
+
+# Setup
+def prepare_database(sessions, timeout):
+    # One warm-up run lets init_db create the schema and seed the tools
+    with harness_main():
+        AppTest.from_file(APP_FILE, default_timeout=timeout).run()
+    hashed_password = hashlib.sha256(PASSWORD.encode()).hexdigest()
+    emails = [f"loadtest{i}@audittools.com" for i in range(sessions)]
+    conn = _real_connect('audit_tools.db')
+    conn.executemany(
+        "INSERT OR IGNORE INTO users (name, email, password) VALUES (?, ?, ?)",
+        [(f"Load Test {i}", email, hashed_password) for i, email in enumerate(emails)]
+    )
+    conn.commit()
+    conn.close()
+    return emails
+
+# Reporting
+def summarize(timings, db_stats, memory, args, elapsed):
+    df = pd.DataFrame(timings)
+    db = pd.DataFrame(db_stats, columns=['session', 'page', 'db_seconds', 'db_calls', 'lock_wait_seconds', 'lock_errors'])
+    memory = pd.DataFrame(memory, columns=['rss_growth_mb', 'session_state_mb', 'first_in_worker'])
+    first = memory[memory['first_in_worker'].astype(bool)]['rss_growth_mb']
+    later = memory[~memory['first_in_worker'].astype(bool)]['rss_growth_mb']
+    pages = {}
+    for page in PAGES:
+        rows = df[df['page'] == page] if not df.empty else df
+        if rows.empty:
+            continue
+        seconds = rows['seconds']
+        page_db = db[db['page'] == page]
+        pages[page] = {
+            'runs': int(len(rows)),
+            'errors': int((rows['error'] != '').sum()),
+            'p50_ms': round(seconds.quantile(0.5) * 1000, 1),
+            'p95_ms': round(seconds.quantile(0.95) * 1000, 1),
+            'max_ms': round(seconds.max() * 1000, 1),
+            'db_ms_per_run': round(page_db['db_seconds'].sum() * 1000 / len(rows), 1),
+            'db_calls_per_run': round(page_db['db_calls'].sum() / len(rows), 1),
+            'lock_wait_ms_per_run': round(page_db['lock_wait_seconds'].sum() * 1000 / len(rows), 1),
+            'lock_errors': int(page_db['lock_errors'].sum()),
+        }
+    errors = df[df['error'] != ''][['session', 'page', 'error']].drop_duplicates('error').head(10) if not df.empty else df
+    return {
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'settings': {'concurrency': args.concurrency, 'sessions': args.sessions,
+                     'iterations': args.iterations, 'challans': args.challans},
+        'wall_seconds': round(elapsed, 1),
+        'memory': {
+            'rss_kind': RSS_KIND,
+            # First sessions include importing the app; later ones run in a reused worker
+            'rss_growth_first_session_mb': round(first.mean(), 2) if not first.empty else None,
+            'rss_growth_later_sessions_mb': round(later.mean(), 2) if not later.empty else None,
+            'rss_growth_max_mb': round(memory['rss_growth_mb'].max(), 2),
+            'session_state_mb_avg': round(memory['session_state_mb'].mean(), 2),
+        },
+        'pages': pages,
+        'sample_errors': errors.to_dict('records'),
+    }
+
+def print_report(report, baseline=None):
+    settings = report['settings']
+    print(f"\n{settings['sessions']} sessions, concurrency {settings['concurrency']}, "
+          f"{settings['iterations']} iteration(s), {settings['challans']} challans per extraction "
+          f"- {report['wall_seconds']}s wall time")
+
+    if baseline and baseline['settings'] != settings:
+        print(f"Note: baseline ran with different settings {baseline['settings']}")
+
+    rows = []
+    for page, stats in report['pages'].items():
+        row = {'page': page, **stats}
+        if baseline and page in baseline['pages']:
+            before = baseline['pages'][page]
+            for metric in ('p50_ms', 'p95_ms', 'db_ms_per_run', 'lock_wait_ms_per_run'):
+                if before.get(metric):
+                    row[f"{metric} vs base"] = f"{(stats[metric] - before[metric]) / before[metric] * 100:+.0f}%"
+        rows.append(row)
+    print(pd.DataFrame(rows).to_string(index=False))
+
+    def memory_line(memory):
+        line = f"{memory['rss_growth_first_session_mb']} MB for a worker's first session"
+        if memory['rss_growth_later_sessions_mb'] is not None:
+            line += f", {memory['rss_growth_later_sessions_mb']} MB for later sessions"
+        return line + f", session state {memory['session_state_mb_avg']} MB per session"
+
+    memory = report['memory']
+    kind = " (peak RSS)" if memory.get('rss_kind') == 'peak' else ""
+    print(f"\nMemory growth{kind} {memory_line(memory)} (max {memory['rss_growth_max_mb']} MB)")
+    if baseline and 'rss_growth_first_session_mb' in baseline['memory']:
+        print(f"Baseline: {memory_line(baseline['memory'])}")
+    for error in report['sample_errors']:
+        print(f"Error on {error['page']} (session {error['session']}): {error['error']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Audit Tools app with concurrent scripted sessions.")
+    parser.add_argument('--concurrency', type=int, default=20, help="sessions running at the same time (one worker process each)")
+    parser.add_argument('--sessions', type=int, help="total sessions to run (default: same as concurrency)")
+    parser.add_argument('--iterations', type=int, default=1, help="times each session repeats the page loop after login")
+    parser.add_argument('--challans', type=int, default=200, help="challan rows per simulated extraction")
+    parser.add_argument('--timeout', type=float, default=120, help="seconds before a single rerun is treated as failed")
+    parser.add_argument('--workdir', help="directory for the scratch database, which must not be the app directory or already hold audit_tools.db (default: a new temporary directory)")
+    parser.add_argument('--report', help="write the JSON report to this file")
+    parser.add_argument('--compare', help="JSON report from an earlier run to compare against")
+    args = parser.parse_args()
+    args.sessions = args.sessions or args.concurrency
+    report_path = os.path.abspath(args.report) if args.report else None
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    if args.workdir and (os.path.exists(os.path.join(args.workdir, 'audit_tools.db'))
+                         or os.path.abspath(args.workdir) == os.path.dirname(APP_FILE)):
+        parser.error(f"{args.workdir} is the app directory or already holds an audit_tools.db; use an empty directory so no real data is touched")
+    workdir = args.workdir or tempfile.mkdtemp(prefix='audit_tools_load_')
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    print(f"Using scratch database in {workdir}")
+
+    timings = []
+    db_stats = []
+    memory = []
+    with ProcessPoolExecutor(max_workers=args.concurrency) as executor:
+        # Even the warm-up runs in a worker so AppTest never touches this process
+        emails = executor.submit(prepare_database, args.sessions, args.timeout).result()
+        started = time.perf_counter()
+        futures = {executor.submit(run_session, i, email, args): i for i, email in enumerate(emails)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            session_timings, session_db_stats, session_memory = future.result()
+            timings.extend(session_timings)
+            db_stats.extend(dict(stats, session=futures[future], page=page) for page, stats in session_db_stats.items())
+            memory.append(session_memory)
+            print(f"\r{done}/{len(futures)} sessions finished", end='', file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    print(file=sys.stderr)
+
+    report = summarize(timings, db_stats, memory, args, elapsed)
+    baseline = None
+    if compare_path:
+        with open(compare_path) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {report_path}")
+
+if __name__ == '__main__':
+    main()
@@ -7,8 +7,13 @@ import os
 from datetime import datetime, timedelta
 import base64
 from PIL import Image
+import plotly.express as px
 import io
 import json
+import math
+import struct
+import time
+import zlib
 from pathlib import Path
 
 # Set page configuration
@@ -241,11 +246,44 @@ def init_db():
             results TEXT,
             status TEXT DEFAULT 'draft',
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            results_format TEXT DEFAULT 'json',
+            parameters TEXT,
             FOREIGN KEY (user_id) REFERENCES users (id),
             FOREIGN KEY (tool_id) REFERENCES tools (id)
         )
     ''')
 
+    # Older databases lack the columns added to projects since the first release
+    c.execute("PRAGMA table_info(projects)")
+    project_columns = [column[1] for column in c.fetchall()]
+    if 'results_format' not in project_columns:
+        c.execute("ALTER TABLE projects ADD COLUMN results_format TEXT DEFAULT 'json'")
+    if 'parameters' not in project_columns:
+        c.execute("ALTER TABLE projects ADD COLUMN parameters TEXT")
+
+    # TDS analytics summary, maintained incrementally by save_project
+    c.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'tds_summary'")
+    summary_exists = c.fetchone() is not None
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS tds_summary (
+            tan TEXT NOT NULL,
+            assessment_year TEXT NOT NULL,
+            month TEXT NOT NULL,
+            nature_of_payment TEXT NOT NULL,
+            challan_count INTEGER DEFAULT 0,
+            amount REAL DEFAULT 0,
+            tax REAL DEFAULT 0,
+            surcharge REAL DEFAULT 0,
+            cess REAL DEFAULT 0,
+            interest REAL DEFAULT 0,
+            penalty REAL DEFAULT 0,
+            fee_234e REAL DEFAULT 0,
+            PRIMARY KEY (tan, assessment_year, month, nature_of_payment)
+        )
+    ''')
+    if not summary_exists:
+        rebuild_tds_summary(c)
+
     # Check if admin user exists, create if not
     c.execute("SELECT * FROM users WHERE email = 'admin@audittools.com'")
     if not c.fetchone():
@@ -271,6 +309,28 @@ def init_db():
                 tool
             )
 
+    # Built-in tools added after the first release are registered by name;
+    # placeholder rows seeded earlier are switched over to the native page
+    native_tools = [
+        ("Excel Ledger Analyzer", "Profile large Excel ledgers: column types, totals, duplicate keys and outliers", "data", "📊", None, None, "integrated"),
+        ("Hash Generator", "Generate various hash types for files and text", "crypto", "#️⃣", None, None, "integrated"),
+        ("Audit Sampling", "Monetary-unit, stratified and systematic sampling over large populations", "data", "🎯", None, None, "integrated"),
+    ]
+    for tool in native_tools:
+        c.execute("SELECT access_type FROM tools WHERE name = ?", (tool[0],))
+        existing = c.fetchone()
+        if not existing:
+            c.execute(
+                "INSERT INTO tools (name, description, category, icon, python_file, html_file, access_type) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                tool
+            )
+        elif existing[0] != tool[6]:
+            # init_db runs on every rerun; an UPDATE matching nothing still takes the write lock
+            c.execute(
+                "UPDATE tools SET html_file = ?, access_type = ? WHERE name = ?",
+                (tool[5], tool[6], tool[0])
+            )
+
     conn.commit()
     conn.close()
 
@@ -315,12 +375,22 @@ def get_tools():
     conn.close()
     return tools
 
-# Get projects for user
+def get_tool_id(name):
+    conn = sqlite3.connect('audit_tools.db')
+    c = conn.cursor()
+    c.execute("SELECT id FROM tools WHERE name = ?", (name,))
+    tool = c.fetchone()
+    conn.close()
+    return tool[0] if tool else None
+
+# Get projects for user (results are loaded on demand via load_project_results)
 def get_user_projects(user_id):
     conn = sqlite3.connect('audit_tools.db')
     c = conn.cursor()
     c.execute('''
-        SELECT p.*, t.name as tool_name, t.icon
+        SELECT p.id, p.user_id, p.tool_id, p.name, p.description,
+               p.results IS NOT NULL AS has_results, p.status, p.created_at,
+               t.name as tool_name, t.icon, p.parameters
         FROM projects p
         JOIN tools t ON p.tool_id = t.id
         WHERE p.user_id = ?
@@ -331,18 +401,270 @@ def get_user_projects(user_id):
     return projects
 
 # Save project
-def save_project(user_id, tool_id, name, description, results, status='completed'):
+def save_project(user_id, tool_id, name, description, results, status='completed', parameters=None):
+    results_format, payload = encode_results(results)
     conn = sqlite3.connect('audit_tools.db')
     c = conn.cursor()
     c.execute('''
-        INSERT INTO projects (user_id, tool_id, name, description, results, status)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (user_id, tool_id, name, description, json.dumps(results), status))
-    conn.commit()
+        INSERT INTO projects (user_id, tool_id, name, description, results, status, results_format, parameters)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (user_id, tool_id, name, description, payload, status, results_format,
+          json.dumps(parameters) if parameters is not None else None))
     project_id = c.lastrowid
+    update_tds_summary(c, tool_id, results)
+    conn.commit()
     conn.close()
     return project_id
 
+# Compact results storage
+#
+# Tabular results (a list of row dicts, e.g. extracted challans) are stored
+# column by column: a length-prefixed JSON header lists each column's offset
+# and size, followed by one zlib-compressed JSON array per column, so a
+# reader only inflates the columns it asks for. Rows that lack a key are
+# listed per column in the header so records decode with their own keys. Anything else is stored as
+# zlib-compressed JSON. Rows written before this format keep the 'json' tag.
+RESULTS_FORMAT_JSON = 'json'
+RESULTS_FORMAT_ZCOL = 'zcol'
+RESULTS_FORMAT_ZJSON = 'zjson'
+
+def _is_records(results):
+    return isinstance(results, list) and len(results) > 0 and all(isinstance(row, dict) for row in results)
+
+def encode_results(results):
+    """Return (results_format, payload) for storing results in projects.results."""
+    if not _is_records(results):
+        return RESULTS_FORMAT_ZJSON, zlib.compress(json.dumps(results).encode('utf-8'))
+
+    columns = list(dict.fromkeys(key for row in results for key in row))
+    header_columns = []
+    absent = {}
+    chunks = []
+    offset = 0
+    for column in columns:
+        chunk = zlib.compress(json.dumps([row.get(column) for row in results]).encode('utf-8'))
+        header_columns.append([column, offset, len(chunk)])
+        chunks.append(chunk)
+        offset += len(chunk)
+        missing = [i for i, row in enumerate(results) if column not in row]
+        if missing:
+            absent[column] = missing
+
+    header = json.dumps({'rows': len(results), 'columns': header_columns, 'absent': absent}).encode('utf-8')
+    return RESULTS_FORMAT_ZCOL, struct.pack('>I', len(header)) + header + b''.join(chunks)
+
+def _read_zcol_header(payload):
+    (header_length,) = struct.unpack_from('>I', payload)
+    return json.loads(payload[4:4 + header_length]), 4 + header_length
+
+def decode_result_columns(payload, columns=None):
+    """Inflate a 'zcol' payload into {column: values}, optionally only some columns.
+
+    Rows that never had a column get None, which becomes NaN in a DataFrame.
+    """
+    header, base = _read_zcol_header(payload)
+    wanted = None if columns is None else set(columns)
+
+    data = {}
+    for name, offset, length in header['columns']:
+        if wanted is None or name in wanted:
+            start = base + offset
+            data[name] = json.loads(zlib.decompress(payload[start:start + length]))
+    return data
+
+def decode_results(payload, results_format, columns=None):
+    """Decode stored results back to the object passed to save_project."""
+    if payload is None:
+        return None
+    if results_format == RESULTS_FORMAT_ZCOL:
+        header = _read_zcol_header(payload)[0]
+        data = decode_result_columns(payload, columns)
+        # Size the rows from the header so selecting missing columns still
+        # gives one dict per row, as the json formats do
+        results = [{} for _ in range(header['rows'])]
+        for column, values in data.items():
+            for row, value in zip(results, values):
+                row[column] = value
+        for column, rows in header.get('absent', {}).items():
+            if column in data:
+                for i in rows:
+                    del results[i][column]
+        return results
+
+    if results_format == RESULTS_FORMAT_ZJSON:
+        results = json.loads(zlib.decompress(payload))
+    else:
+        results = json.loads(payload)
+    if columns is not None and _is_records(results):
+        results = [{column: row[column] for column in columns if column in row} for row in results]
+    return results
+
+def _fetch_project_payload(project_id):
+    conn = sqlite3.connect('audit_tools.db')
+    c = conn.cursor()
+    c.execute("SELECT results, results_format FROM projects WHERE id = ?", (project_id,))
+    row = c.fetchone()
+    conn.close()
+    return row
+
+def load_project_results(project_id, columns=None):
+    row = _fetch_project_payload(project_id)
+    if not row:
+        return None
+    return decode_results(row[0], row[1], columns)
+
+def load_project_frame(project_id, columns=None):
+    """Load tabular project results as a DataFrame, or None if they are not tabular."""
+    row = _fetch_project_payload(project_id)
+    if not row or row[0] is None:
+        return None
+    payload, results_format = row
+    if results_format == RESULTS_FORMAT_ZCOL:
+        data = decode_result_columns(payload, columns)
+        return pd.DataFrame(data, columns=list(data))
+
+    results = decode_results(payload, results_format, columns)
+    if not _is_records(results):
+        return None
+    return pd.DataFrame(results)
+
+def get_results_storage_stats():
+    conn = sqlite3.connect('audit_tools.db')
+    c = conn.cursor()
+    c.execute('''
+        SELECT COALESCE(results_format, 'json'), COUNT(*), COALESCE(SUM(LENGTH(CAST(results AS BLOB))), 0)
+        FROM projects
+        WHERE results IS NOT NULL
+        GROUP BY COALESCE(results_format, 'json')
+    ''')
+    stats = c.fetchall()
+    conn.close()
+    return stats
+
+RESULTS_MIGRATION_BATCH = 50
+
+def migrate_project_results():
+    """Convert legacy JSON results to the compact format and report the savings.
+
+    Commits every RESULTS_MIGRATION_BATCH projects so other users' saves are
+    not locked out for the whole conversion.
+    """
+    report = {'rows': 0, 'bytes_before': 0, 'bytes_after': 0, 'load_before': 0.0, 'load_after': 0.0}
+
+    conn = sqlite3.connect('audit_tools.db')
+    c = conn.cursor()
+    c.execute(
+        "SELECT id FROM projects WHERE results IS NOT NULL AND COALESCE(results_format, ?) = ?",
+        (RESULTS_FORMAT_JSON, RESULTS_FORMAT_JSON)
+    )
+    project_ids = [row[0] for row in c.fetchall()]
+
+    for project_id in project_ids:
+        c.execute("SELECT results FROM projects WHERE id = ?", (project_id,))
+        legacy = c.fetchone()[0]
+        legacy_bytes = legacy.encode('utf-8') if isinstance(legacy, str) else legacy
+
+        started = time.perf_counter()
+        results = json.loads(legacy_bytes)
+        report['load_before'] += time.perf_counter() - started
+
+        results_format, payload = encode_results(results)
+
+        started = time.perf_counter()
+        decode_results(payload, results_format)
+        report['load_after'] += time.perf_counter() - started
+
+        c.execute(
+            "UPDATE projects SET results = ?, results_format = ? WHERE id = ?",
+            (payload, results_format, project_id)
+        )
+        report['rows'] += 1
+        report['bytes_before'] += len(legacy_bytes)
+        report['bytes_after'] += len(payload)
+        if report['rows'] % RESULTS_MIGRATION_BATCH == 0:
+            conn.commit()
+
+    conn.commit()
+    conn.close()
+    return report
+
+# TDS analytics summary
+#
+# tds_summary holds running totals per (TAN, assessment year, deposit month,
+# nature of payment). save_project folds new challans into it in the same
+# transaction as the project insert, so analytics never re-read results blobs.
+TDS_SUMMARY_AMOUNTS = ['amount', 'tax', 'surcharge', 'cess', 'interest', 'penalty', 'fee_234e']
+TDS_SUMMARY_COLUMNS = ['tan', 'assessment_year', 'date_of_deposit', 'nature_of_payment'] + TDS_SUMMARY_AMOUNTS
+
+def _to_amount(value):
+    try:
+        return float(str(value).replace(',', '')) if value not in (None, '') else 0.0
+    except ValueError:
+        return 0.0
+
+def _deposit_month(date_of_deposit):
+    try:
+        return datetime.strptime(str(date_of_deposit).replace('/', '-'), '%d-%b-%Y').strftime('%Y-%m')
+    except ValueError:
+        return 'Unknown'
+
+def summarize_challans(results):
+    """Group challan rows into {(tan, ay, month, nature): [count, *amounts]}."""
+    summary = {}
+    if not _is_records(results):
+        return summary
+
+    for row in results:
+        key = (
+            row.get('tan') or 'Unknown',
+            row.get('assessment_year') or 'Unknown',
+            _deposit_month(row.get('date_of_deposit')),
+            row.get('nature_of_payment') or 'Unknown',
+        )
+        totals = summary.setdefault(key, [0] + [0.0] * len(TDS_SUMMARY_AMOUNTS))
+        totals[0] += 1
+        for i, field in enumerate(TDS_SUMMARY_AMOUNTS, start=1):
+            totals[i] += _to_amount(row.get(field))
+    return summary
+
+def _tds_tool_id(c):
+    c.execute("SELECT id FROM tools WHERE name = 'TDS Challan Extractor'")
+    tool = c.fetchone()
+    return tool[0] if tool else None
+
+def update_tds_summary(c, tool_id, results):
+    # Only extractor projects hold original challans; other tools (e.g. a
+    # sample drawn from them) may carry the same columns but must not count twice
+    if tool_id is None or tool_id != _tds_tool_id(c):
+        return
+    summary = summarize_challans(results)
+    if not summary:
+        return
+    columns = ', '.join(TDS_SUMMARY_AMOUNTS)
+    placeholders = ', '.join('?' * (5 + len(TDS_SUMMARY_AMOUNTS)))
+    updates = ', '.join(f"{field} = {field} + excluded.{field}" for field in ['challan_count'] + TDS_SUMMARY_AMOUNTS)
+    c.executemany(f'''
+        INSERT INTO tds_summary (tan, assessment_year, month, nature_of_payment, challan_count, {columns})
+        VALUES ({placeholders})
+        ON CONFLICT (tan, assessment_year, month, nature_of_payment) DO UPDATE SET {updates}
+    ''', [key + tuple(totals) for key, totals in summary.items()])
+
+def rebuild_tds_summary(c):
+    """Recompute tds_summary from every saved project (used once when the table is created)."""
+    c.execute("DELETE FROM tds_summary")
+    tool_id = _tds_tool_id(c)
+    c.execute("SELECT id FROM projects WHERE results IS NOT NULL AND tool_id = ?", (tool_id,))
+    for (project_id,) in c.fetchall():
+        c.execute("SELECT results, results_format FROM projects WHERE id = ?", (project_id,))
+        payload, results_format = c.fetchone()
+        update_tds_summary(c, tool_id, decode_results(payload, results_format, TDS_SUMMARY_COLUMNS))
+
+def get_tds_summary():
+    conn = sqlite3.connect('audit_tools.db')
+    df = pd.read_sql_query("SELECT * FROM tds_summary", conn)
+    conn.close()
+    return df
+
 # TDS Challan Extractor Functions
 import fitz  # PyMuPDF
 import re
@@ -405,6 +727,580 @@ def parse_challan_data(text):
 
     return data
 
+# Excel Ledger Analyzer Functions
+#
+# Workbooks are streamed with openpyxl's read-only mode and profiled a chunk
+# of rows at a time. Memory is bounded by the chunk size, a fixed-size random
+# sample and a few extreme values per numeric column, and one hash per
+# distinct duplicate key - never by the full sheet.
+from openpyxl import load_workbook
+import numpy as np
+
+LEDGER_CHUNK_ROWS = 10000
+LEDGER_SAMPLE_SIZE = 10000
+LEDGER_OUTLIER_CANDIDATES = 50
+LEDGER_MAX_DUPLICATE_KEYS = 500
+
+def _ledger_headers(row, start=1):
+    headers = []
+    for i, value in enumerate(row, start=start):
+        name = str(value).strip() if value not in (None, '') else f"Column {i}"
+        if name in headers:
+            name = f"{name} ({i})"
+        headers.append(name)
+    return headers
+
+def get_workbook_headers(uploaded_file):
+    """Return {sheet name: header row} without reading past the first row."""
+    uploaded_file.seek(0)
+    workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        headers = {}
+        for sheet in workbook.worksheets:
+            first_row = next(sheet.iter_rows(max_row=1, values_only=True), ())
+            headers[sheet.title] = _ledger_headers(first_row)
+        return headers
+    finally:
+        workbook.close()
+        uploaded_file.seek(0)
+
+def _new_column_profile():
+    empty = np.empty(0)
+    no_rows = np.empty(0, dtype=np.int64)
+    return {
+        'count': 0, 'missing': 0,
+        'types': {'number': 0, 'date': 0, 'text': 0, 'bool': 0},
+        'n': 0, 'mean': 0.0, 'm2': 0.0, 'sum': 0.0, 'min': None, 'max': None,
+        'date_min': None, 'date_max': None, 'max_length': 0,
+        'sample_keys': empty, 'sample': empty,
+        'high': (empty, no_rows), 'low': (empty, no_rows),
+    }
+
+def _keep_extremes(current, values, rows, largest):
+    values = np.concatenate([current[0], values])
+    rows = np.concatenate([current[1], rows])
+    if len(values) > LEDGER_OUTLIER_CANDIDATES:
+        order = -values if largest else values
+        keep = np.argpartition(order, LEDGER_OUTLIER_CANDIDATES)[:LEDGER_OUTLIER_CANDIDATES]
+        values, rows = values[keep], rows[keep]
+    return values, rows
+
+def _update_column_profile(profile, values, row_numbers, rng):
+    types = profile['types']
+    numbers = []
+    number_rows = []
+    for value, row_number in zip(values, row_numbers):
+        if value is None or value == '':
+            profile['missing'] += 1
+        elif isinstance(value, bool):
+            types['bool'] += 1
+        elif isinstance(value, (int, float)):
+            types['number'] += 1
+            numbers.append(value)
+            number_rows.append(row_number)
+        elif isinstance(value, datetime):
+            types['date'] += 1
+            if profile['date_min'] is None or value < profile['date_min']:
+                profile['date_min'] = value
+            if profile['date_max'] is None or value > profile['date_max']:
+                profile['date_max'] = value
+        else:
+            text = str(value).strip()
+            try:
+                # Ledgers exported from other systems often hold amounts as text
+                parsed = float(text.replace(',', ''))
+            except ValueError:
+                parsed = None
+            # float() also accepts "nan" and "inf", which would poison the totals
+            if parsed is not None and math.isfinite(parsed):
+                numbers.append(parsed)
+                number_rows.append(row_number)
+                types['number'] += 1
+            else:
+                types['text'] += 1
+                profile['max_length'] = max(profile['max_length'], len(text))
+    profile['count'] += len(values)
+
+    if not numbers:
+        return
+    chunk = np.asarray(numbers, dtype=float)
+    chunk_rows = np.asarray(number_rows, dtype=np.int64)
+
+    # Merge running mean/variance (Chan et al. parallel update)
+    n_a, n_b = profile['n'], len(chunk)
+    mean_b = chunk.mean()
+    m2_b = ((chunk - mean_b) ** 2).sum()
+    delta = mean_b - profile['mean']
+    n = n_a + n_b
+    profile['mean'] += delta * n_b / n
+    profile['m2'] += m2_b + delta ** 2 * n_a * n_b / n
+    profile['n'] = n
+    profile['sum'] += chunk.sum()
+    chunk_min, chunk_max = chunk.min(), chunk.max()
+    profile['min'] = chunk_min if profile['min'] is None else min(profile['min'], chunk_min)
+    profile['max'] = chunk_max if profile['max'] is None else max(profile['max'], chunk_max)
+
+    # Bottom-k sample on random keys is a uniform sample of every value seen
+    keys = np.concatenate([profile['sample_keys'], rng.random(n_b)])
+    sample = np.concatenate([profile['sample'], chunk])
+    if len(keys) > LEDGER_SAMPLE_SIZE:
+        keep = np.argpartition(keys, LEDGER_SAMPLE_SIZE)[:LEDGER_SAMPLE_SIZE]
+        keys, sample = keys[keep], sample[keep]
+    profile['sample_keys'], profile['sample'] = keys, sample
+
+    profile['high'] = _keep_extremes(profile['high'], chunk, chunk_rows, largest=True)
+    profile['low'] = _keep_extremes(profile['low'], chunk, chunk_rows, largest=False)
+
+def _finish_column_profile(name, profile):
+    types = profile['types']
+    present = profile['count'] - profile['missing']
+    inferred = max(types, key=types.get) if present else 'empty'
+    summary = {
+        'column': name,
+        'type': inferred,
+        'values': present,
+        'missing': profile['missing'],
+        'numbers': types['number'],
+        'dates': types['date'],
+        'texts': types['text'],
+        'total': None, 'mean': None, 'std': None, 'min': None, 'max': None,
+        'estimated_outliers': None,
+    }
+    outliers = []
+
+    if inferred == 'number' and profile['n']:
+        n = profile['n']
+        summary.update({
+            'total': round(float(profile['sum']), 2),
+            'mean': round(float(profile['mean']), 2),
+            'std': round(float(np.sqrt(profile['m2'] / (n - 1))), 2) if n > 1 else 0.0,
+            'min': float(profile['min']),
+            'max': float(profile['max']),
+        })
+
+        # Tukey's far-out fences, estimated from the sample
+        q1, q3 = np.percentile(profile['sample'], [25, 75])
+        iqr = q3 - q1
+        if iqr > 0:
+            low_fence, high_fence = q1 - 3 * iqr, q3 + 3 * iqr
+            outside = (profile['sample'] < low_fence) | (profile['sample'] > high_fence)
+            summary['estimated_outliers'] = int(round(outside.mean() * n))
+            # Small columns can hold the same row among both the highs and the lows
+            candidates = {}
+            for values, rows in (profile['high'], profile['low']):
+                candidates.update(zip(rows.tolist(), values.tolist()))
+            for row, value in candidates.items():
+                if value < low_fence or value > high_fence:
+                    distance = (value - q3) / iqr if value > high_fence else (q1 - value) / iqr
+                    outliers.append({'column': name, 'row': row, 'value': value,
+                                     'iqrs_beyond_quartile': round(float(distance), 1)})
+            # Rare extremes can miss the sample entirely; confirmed ones always count
+            summary['estimated_outliers'] = max(summary['estimated_outliers'], len(outliers))
+        else:
+            summary['estimated_outliers'] = 0
+    elif inferred == 'date':
+        summary['min'] = str(profile['date_min'])
+        summary['max'] = str(profile['date_max'])
+
+    outliers.sort(key=lambda outlier: outlier['iqrs_beyond_quartile'], reverse=True)
+    return summary, outliers
+
+def _json_cell(value):
+    # Key cells can be dates or times; keep saved results JSON-serialisable
+    return value if value is None or isinstance(value, (str, int, float, bool)) else str(value)
+
+def _profile_sheet(sheet, key_columns, chunk_rows, progress):
+    rng = np.random.default_rng(0)
+    rows = sheet.iter_rows(values_only=True)
+    headers = _ledger_headers(next(rows, ()))
+    profiles = [_new_column_profile() for _ in headers]
+    key_indexes = [headers.index(column) for column in key_columns] if all(column in headers for column in key_columns) else []
+
+    seen_keys = {}
+    duplicate_keys = {}
+    duplicate_rows = 0
+    data_rows = 0
+    blank_rows = 0
+    row_number = 1
+
+    def process(chunk, chunk_row_numbers):
+        width = max(len(row) for row in chunk)
+        if width > len(headers):
+            headers.extend(_ledger_headers([None] * (width - len(headers)), start=len(headers) + 1))
+            profiles.extend(_new_column_profile() for _ in range(width - len(profiles)))
+        padded = [row + (None,) * (len(headers) - len(row)) for row in chunk]
+        for profile, values in zip(profiles, zip(*padded)):
+            _update_column_profile(profile, values, chunk_row_numbers, rng)
+
+    chunk = []
+    chunk_row_numbers = []
+    for row in rows:
+        row_number += 1
+        if all(value is None or value == '' for value in row):
+            blank_rows += 1
+            continue
+        data_rows += 1
+        chunk.append(row)
+        chunk_row_numbers.append(row_number)
+
+        if key_indexes:
+            key = tuple(row[i] if i < len(row) else None for i in key_indexes)
+            if any(value not in (None, '') for value in key):
+                key_hash = hash(key)
+                if key_hash in seen_keys:
+                    duplicate_rows += 1
+                    if key in duplicate_keys:
+                        duplicate_keys[key]['count'] += 1
+                    elif len(duplicate_keys) < LEDGER_MAX_DUPLICATE_KEYS:
+                        duplicate_keys[key] = {'count': 2, 'first_row': seen_keys[key_hash]}
+                else:
+                    seen_keys[key_hash] = row_number
+
+        if len(chunk) >= chunk_rows:
+            process(chunk, chunk_row_numbers)
+            chunk, chunk_row_numbers = [], []
+            if progress:
+                progress(sheet.title, data_rows)
+    if chunk:
+        process(chunk, chunk_row_numbers)
+    if progress:
+        progress(sheet.title, data_rows)
+
+    columns = []
+    outliers = []
+    for name, profile in zip(headers, profiles):
+        summary, column_outliers = _finish_column_profile(name, profile)
+        columns.append(summary)
+        outliers.extend(column_outliers)
+
+    return {
+        'rows': data_rows,
+        'blank_rows': blank_rows,
+        'columns': columns,
+        'outliers': outliers,
+        'key_columns': key_columns if key_indexes else [],
+        'duplicate_rows': duplicate_rows,
+        'duplicates': [
+            dict(zip(key_columns, map(_json_cell, key)), count=info['count'], first_row=info['first_row'])
+            for key, info in sorted(duplicate_keys.items(), key=lambda item: -item[1]['count'])
+        ],
+    }
+
+def profile_excel_workbook(uploaded_file, sheets=None, key_columns=None, chunk_rows=LEDGER_CHUNK_ROWS, progress=None):
+    """Stream each sheet of an XLSX workbook and return {sheet name: profile}."""
+    uploaded_file.seek(0)
+    workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        results = {}
+        for sheet in workbook.worksheets:
+            if sheets and sheet.title not in sheets:
+                continue
+            results[sheet.title] = _profile_sheet(sheet, key_columns or [], chunk_rows, progress)
+        return results
+    finally:
+        workbook.close()
+
+# Hash Generator Functions
+#
+# Every file is read once in fixed-size chunks and each chunk feeds all the
+# digests. hashlib releases the GIL on large updates, so files (and ZIP
+# members) are hashed in parallel on a thread pool; each task opens its own
+# stream over the shared upload bytes, so no file object crosses threads.
+# UploadedFile.getvalue() hands back the upload's own bytes without copying
+# (BytesIO shares its initial bytes until written), whereas getbuffer()
+# forces a private copy of the whole file, so callers pass getvalue().
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+HASH_ALGORITHMS = ['md5', 'sha1', 'sha256', 'sha512']
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+def _is_zip_archive(name):
+    # .xlsx, .docx and .jar are ZIP files too, but their parts are not evidence
+    return name.lower().endswith('.zip')
+
+def hash_stream(stream, algorithms=HASH_ALGORITHMS, chunk_size=HASH_CHUNK_SIZE):
+    """Hash a binary stream with every algorithm in one pass; returns (size, {algorithm: hexdigest})."""
+    hashers = [hashlib.new(algorithm) for algorithm in algorithms]
+    size = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        for hasher in hashers:
+            hasher.update(chunk)
+    return size, {algorithm: hasher.hexdigest() for algorithm, hasher in zip(algorithms, hashers)}
+
+def _hash_tasks(name, data, expand_zips):
+    """Return (entry name, data, ZIP member or None) for an upload and, optionally, its members."""
+    tasks = [(name, data, None)]
+    if expand_zips and _is_zip_archive(name) and zipfile.is_zipfile(io.BytesIO(data)):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            tasks.extend((f"{name}/{info.filename}", data, info.filename) for info in archive.infolist() if not info.is_dir())
+    return tasks
+
+def _hash_entry(name, data, member, algorithms):
+    entry = {'name': name, 'size': None}
+    try:
+        if member is None:
+            entry['size'], digests = hash_stream(io.BytesIO(data), algorithms)
+        else:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive, archive.open(member) as stream:
+                entry['size'], digests = hash_stream(stream, algorithms)
+        entry.update(digests)
+        entry['error'] = ''
+    except Exception as e:
+        entry.update({algorithm: '' for algorithm in algorithms})
+        entry['error'] = str(e)
+    return entry
+
+def hash_files(files, algorithms=HASH_ALGORITHMS, expand_zips=True, progress=None):
+    """Hash [(name, bytes)] on a thread pool and return manifest rows in input order."""
+    tasks = [task for name, data in files for task in _hash_tasks(name, data, expand_zips)]
+    entries = [None] * len(tasks)
+    with ThreadPoolExecutor(max_workers=HASH_MAX_WORKERS) as executor:
+        futures = {executor.submit(_hash_entry, *task, algorithms): i for i, task in enumerate(tasks)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            entries[futures[future]] = future.result()
+            if progress:
+                progress(done, len(tasks))
+    return entries
+
+def _manifest_size(value):
+    # Manifests written with a failed entry may hold sizes as floats ("5.0")
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def verify_manifest(manifest, entries, algorithms=HASH_ALGORITHMS):
+    """Compare freshly computed entries with a saved manifest DataFrame."""
+    current = {entry['name']: entry for entry in entries}
+    checked = [algorithm for algorithm in algorithms if algorithm in manifest.columns]
+    rows = []
+    for record in manifest.fillna('').to_dict('records'):
+        name = str(record['name'])
+        entry = current.pop(name, None)
+        if entry is None:
+            status = 'Missing'
+        elif entry['error']:
+            status = f"Error: {entry['error']}"
+        else:
+            mismatched = [a for a in checked if record[a] and str(record[a]).lower() != entry[a]]
+            if _manifest_size(record.get('size')) not in (None, entry['size']):
+                mismatched.append('size')
+            status = 'Match' if not mismatched else f"Mismatch ({', '.join(mismatched)})"
+        rows.append({'name': name, 'status': status})
+    rows.extend({'name': name, 'status': 'Not in manifest'} for name in current)
+    return rows
+
+# Audit Sampling Functions
+#
+# Selections are computed with vectorised NumPy operations over the whole
+# population (cumulative sums, searchsorted, lexsort) rather than row loops,
+# and every random draw comes from a generator seeded by the user, so saving
+# the parameters with the project is enough to re-perform the sample.
+SAMPLING_METHODS = ["Monetary Unit", "Stratified Random", "Systematic"]
+
+# Reliability factors for zero expected misstatements (Poisson)
+MUS_RELIABILITY_FACTORS = {80: 1.61, 90: 2.31, 95: 3.00, 99: 4.61}
+
+def sampling_amounts(series):
+    """Convert a population column to absolute float amounts, treating blanks as zero."""
+    if not pd.api.types.is_numeric_dtype(series):
+        series = pd.to_numeric(series.astype(str).str.replace(',', '', regex=False), errors='coerce')
+    return np.abs(np.nan_to_num(series.to_numpy(dtype=float), nan=0.0))
+
+def mus_sample_size(total_value, confidence, tolerable_misstatement):
+    if tolerable_misstatement <= 0:
+        return 0
+    return int(np.ceil(total_value * MUS_RELIABILITY_FACTORS[confidence] / tolerable_misstatement))
+
+def monetary_unit_sample(amounts, sample_size, seed):
+    """Systematic MUS with a random start; returns (positions, hits, interval, start)."""
+    total = amounts.sum()
+    # More selections than items only piles extra hits onto the same rows
+    sample_size = min(sample_size, len(amounts))
+    if sample_size <= 0 or total <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), 0.0, 0.0
+    interval = total / sample_size
+    start = np.random.default_rng(seed).uniform(0, interval)
+
+    # Item i covers the monetary units (cumulative[i - 1], cumulative[i]]
+    cumulative = np.cumsum(amounts)
+    points = start + interval * np.arange(sample_size)
+    positions = np.minimum(np.searchsorted(cumulative, points, side='right'), len(amounts) - 1)
+    positions, hits = np.unique(positions, return_counts=True)
+    return positions, hits, interval, start
+
+def _largest_remainder(total, weights, capacity):
+    """Split total across weights by largest remainder, never exceeding capacity."""
+    allocated = np.zeros(len(weights), dtype=np.int64)
+    remaining = total
+    while remaining > 0:
+        spare = allocated < capacity
+        open_weights = np.where(spare, weights, 0.0)
+        if open_weights.sum() <= 0:
+            open_weights = spare.astype(float)
+        quota = remaining * open_weights / open_weights.sum()
+        allocated += np.minimum(np.floor(quota).astype(np.int64), capacity - allocated)
+        remaining = total - allocated.sum()
+        # Hand the rest out one each, largest fractional part first
+        spare = allocated < capacity
+        order = np.argsort(np.floor(quota) - quota, kind='stable')
+        allocated[order[spare[order]][:remaining]] += 1
+        remaining = total - allocated.sum()
+    return allocated
+
+def stratified_random_sample(amounts, sample_size, strata_count, seed, allocation='value'):
+    """Stratify by value quantiles and draw a random sample from each stratum.
+
+    Returns (positions, stratum of each position, per-stratum summary rows).
+    """
+    edges = np.unique(np.quantile(amounts, np.linspace(0, 1, strata_count + 1)))
+    if len(edges) < 2:
+        edges = np.array([edges[0], edges[0]])
+    strata_count = len(edges) - 1
+    strata = np.clip(np.searchsorted(edges, amounts, side='right') - 1, 0, strata_count - 1)
+
+    counts = np.bincount(strata, minlength=strata_count)
+    weights = np.bincount(strata, weights=amounts, minlength=strata_count) if allocation == 'value' else counts.astype(float)
+    if weights.sum() <= 0:
+        weights = counts.astype(float)
+    # Exactly sample_size in total; every stratum gets one only if there are enough to go round
+    sample_size = min(sample_size, len(amounts))
+    minimum = (counts > 0).astype(np.int64) if sample_size >= np.count_nonzero(counts) else np.zeros(strata_count, dtype=np.int64)
+    allocated = minimum + _largest_remainder(sample_size - minimum.sum(), weights, counts - minimum)
+
+    # Rank items within their stratum by a random key in [0, 1) and keep the first k
+    keys = np.random.default_rng(seed).random(len(amounts))
+    order = np.argsort(strata + keys)
+    sorted_strata = strata[order]
+    stratum_starts = np.searchsorted(sorted_strata, np.arange(strata_count))
+    rank = np.arange(len(order)) - stratum_starts[sorted_strata]
+    positions = np.sort(order[rank < allocated[sorted_strata]])
+
+    value_totals = np.bincount(strata, weights=amounts, minlength=strata_count)
+    summary = [
+        {'stratum': i + 1, 'from': float(edges[i]), 'to': float(edges[i + 1]), 'items': int(counts[i]),
+         'value': round(float(value_totals[i]), 2), 'sample': int(allocated[i])}
+        for i in range(strata_count)
+    ]
+    return positions, strata[positions] + 1, summary
+
+def systematic_sample(population_size, sample_size, seed):
+    """Every k-th item from a random start; returns (positions, interval, start)."""
+    sample_size = min(sample_size, population_size)
+    if sample_size <= 0:
+        return np.empty(0, dtype=np.int64), 0.0, 0.0
+    interval = population_size / sample_size
+    start = np.random.default_rng(seed).uniform(0, interval)
+    positions = np.floor(start + interval * np.arange(sample_size)).astype(np.int64)
+    return positions, interval, start
+
+def load_sampling_population(uploaded_file):
+    if uploaded_file.name.lower().endswith('.csv'):
+        return pd.read_csv(uploaded_file)
+    return pd.read_excel(uploaded_file)
+
+# Paged results viewing
+#
+# Large result sets are filtered and sorted server-side and only the visible
+# page is sent to the browser. A filtered/sorted view is memoised in session
+# state (one per table type) so paging through it does not redo the work on
+# every rerun; an unfiltered, unsorted table pages over the frame directly.
+RESULTS_PAGE_SIZES = [25, 50, 100, 250]
+
+def typed_results_frame(df):
+    """Convert challan amount columns (stored as digit strings) to numbers."""
+    for column in TDS_SUMMARY_AMOUNTS:
+        if column in df.columns and not pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = pd.to_numeric(df[column].replace('', None), errors='coerce')
+    return df
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_project_frame(project_id):
+    # Saved results never change, so one read-only frame is shared across sessions
+    df = load_project_frame(project_id)
+    return typed_results_frame(df) if df is not None else None
+
+def _filter_sort_frame(df, filters, sort_by, ascending):
+    view = df
+    if filters:
+        mask = pd.Series(True, index=df.index)
+        for column, kind, value in filters:
+            if kind == 'range':
+                mask &= df[column].between(value[0], value[1])
+            else:
+                mask &= df[column].astype(str).str.contains(value, case=False, regex=False, na=False)
+        view = df[mask]
+    if sort_by:
+        view = view.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last')
+    return view
+
+def render_paged_table(df, key, memo_key=None):
+    """Render df one page at a time with column filters and sorting.
+
+    memo_key names the session-state slot for the memoised view (defaults to
+    key); tables that replace each other, like saved projects, share one.
+    """
+    columns = list(df.columns)
+    memo_key = f"{memo_key or key}_view"
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort_by = st.selectbox("Sort by", ["(none)"] + columns, key=f"{key}_sort")
+    with col2:
+        order = st.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order")
+    with col3:
+        page_size = st.selectbox("Rows per page", RESULTS_PAGE_SIZES, key=f"{key}_page_size")
+
+    filters = []
+    filter_columns = st.multiselect("Filter columns", columns, key=f"{key}_filter_columns")
+    for column in filter_columns:
+        series = df[column]
+        if pd.api.types.is_numeric_dtype(series) and series.notna().any():
+            low, high = float(series.min()), float(series.max())
+            fcol1, fcol2 = st.columns(2)
+            with fcol1:
+                minimum = st.number_input(f"{column} from", value=low, key=f"{key}_min_{column}")
+            with fcol2:
+                maximum = st.number_input(f"{column} to", value=high, key=f"{key}_max_{column}")
+            # The untouched full range is no filter, so blank (NaN) amounts stay visible
+            if (minimum, maximum) != (low, high):
+                filters.append((column, 'range', (minimum, maximum)))
+        else:
+            term = st.text_input(f"{column} contains", key=f"{key}_contains_{column}")
+            if term:
+                filters.append((column, 'contains', term))
+
+    if not filters and sort_by == "(none)":
+        view = df
+        st.session_state.pop(memo_key, None)
+    else:
+        signature = (tuple(filters), sort_by, order)
+        cached = st.session_state.get(memo_key)
+        if cached and cached[0] is df and cached[1] == signature:
+            view = cached[2]
+        else:
+            view = _filter_sort_frame(df, filters, None if sort_by == "(none)" else sort_by, order == "Ascending")
+            st.session_state[memo_key] = (df, signature, view)
+
+    total = len(view)
+    page_count = max(1, -(-total // page_size))
+    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1, key=f"{key}_page")
+    page = min(page, page_count)
+    start = (page - 1) * page_size
+    end = min(start + page_size, total)
+
+    st.dataframe(view.iloc[start:end], use_container_width=True)
+    if total:
+        st.caption(f"Showing rows {start + 1:,}–{end:,} of {total:,}" + (f" (filtered from {len(df):,})" if total != len(df) else ""))
+    else:
+        st.caption(f"No rows match the filters ({len(df):,} rows in total)")
+
 # Main application
 def main():
     load_css()
@@ -430,6 +1326,8 @@ def main():
                 st.session_state.page = 'tools'
             if st.button("📁 Projects", key="nav_projects"):
                 st.session_state.page = 'projects'
+            if st.button("📈 Analytics", key="nav_analytics"):
+                st.session_state.page = 'analytics'
             if st.button("👤 Profile", key="nav_profile"):
                 st.session_state.page = 'profile'
 
@@ -452,6 +1350,8 @@ def main():
         tools_page()
     elif st.session_state.page == 'projects':
         projects_page()
+    elif st.session_state.page == 'analytics':
+        analytics_page()
     elif st.session_state.page == 'profile':
         profile_page()
     elif st.session_state.page == 'admin':
@@ -610,50 +1510,57 @@ def tds_challan_extractor_page():
                         data['file_name'] = file.name
                         all_results.append(data)
 
+                # Keep results across reruns so paging and saving work
+                st.session_state.tds_results = all_results
+                st.session_state.tds_results_frame = typed_results_frame(pd.DataFrame(all_results))
+                st.session_state.tds_file_count = len(uploaded_files)
+
                 if all_results:
-                    # Display results
-                    df = pd.DataFrame(all_results)
                     st.success(f"Successfully processed {len(all_results)} files")
-
-                    # Show data
-                    st.markdown('<div class="data-table">', unsafe_allow_html=True)
-                    st.dataframe(df, use_container_width=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
-
-                    # Summary
-                    total_amount = df['amount'].replace('', 0).astype(float).sum()
-                    total_tax = df['tax'].replace('', 0).astype(float).sum()
-
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.markdown(f'<div class="stats-card"><h3>{len(all_results)}</h3><p>Total Challans</p></div>', unsafe_allow_html=True)
-                    with col2:
-                        st.markdown(f'<div class="stats-card"><h3>₹{total_amount:,.2f}</h3><p>Total Amount</p></div>', unsafe_allow_html=True)
-                    with col3:
-                        st.markdown(f'<div class="stats-card"><h3>₹{total_tax:,.2f}</h3><p>Total Tax</p></div>', unsafe_allow_html=True)
-
-                    # Export options
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download CSV",
-                        data=csv,
-                        file_name=f"tds_challan_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv"
-                    )
-
-                    # Save to projects
-                    if st.button("💾 Save to Projects"):
-                        project_id = save_project(
-                            st.session_state.user_id,
-                            1,  # TDS tool ID
-                            f"TDS Analysis - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-                            f"Processed {len(uploaded_files)} TDS challan files",
-                            all_results
-                        )
-                        st.success(f"Saved to projects with ID: {project_id}")
                 else:
                     st.error("No data could be extracted from the uploaded files.")
 
+    all_results = st.session_state.get('tds_results')
+    if all_results:
+        df = st.session_state.tds_results_frame
+
+        # Show data
+        st.markdown('<div class="data-table">', unsafe_allow_html=True)
+        render_paged_table(df, "tds_results")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Summary
+        total_amount = df['amount'].sum()
+        total_tax = df['tax'].sum()
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown(f'<div class="stats-card"><h3>{len(all_results)}</h3><p>Total Challans</p></div>', unsafe_allow_html=True)
+        with col2:
+            st.markdown(f'<div class="stats-card"><h3>₹{total_amount:,.2f}</h3><p>Total Amount</p></div>', unsafe_allow_html=True)
+        with col3:
+            st.markdown(f'<div class="stats-card"><h3>₹{total_tax:,.2f}</h3><p>Total Tax</p></div>', unsafe_allow_html=True)
+
+        # Export options
+        csv = df.to_csv(index=False)
+        st.download_button(
+            label="📥 Download CSV",
+            data=csv,
+            file_name=f"tds_challan_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+
+        # Save to projects
+        if st.button("💾 Save to Projects"):
+            project_id = save_project(
+                st.session_state.user_id,
+                1,  # TDS tool ID
+                f"TDS Analysis - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+                f"Processed {st.session_state.tds_file_count} TDS challan files",
+                all_results
+            )
+            st.success(f"Saved to projects with ID: {project_id}")
+
     # Instructions
     with st.expander("📋 Instructions"):
         st.markdown("""
@@ -671,6 +1578,355 @@ def tds_challan_extractor_page():
         - TAN and Assessment Year
         """)
 
+def back_to_tools_button():
+    if st.button("← Back to Tools"):
+        st.session_state.page = 'tools'
+        del st.session_state.selected_tool
+        st.rerun()
+
+def excel_ledger_analyzer_page():
+    st.markdown('<div class="main-header"><h1>📊 Excel Ledger Analyzer</h1><p style="color: var(--text-secondary);">Profile large client ledgers without loading them into memory</p></div>', unsafe_allow_html=True)
+    back_to_tools_button()
+
+    # File upload
+    st.markdown('<div class="upload-area">', unsafe_allow_html=True)
+    uploaded_file = st.file_uploader("Upload Excel Workbook", type=['xlsx', 'xlsm'])
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    if uploaded_file:
+        try:
+            headers = get_workbook_headers(uploaded_file)
+        except Exception as e:
+            st.error(f"Error reading workbook: {str(e)}")
+            return
+
+        sheet_names = list(headers)
+        selected_sheets = st.multiselect("Sheets to analyze", sheet_names, default=sheet_names)
+        all_headers = list(dict.fromkeys(h for sheet in selected_sheets for h in headers[sheet]))
+        key_columns = st.multiselect("Duplicate key columns", all_headers,
+                                     help="Rows sharing the same values in these columns are reported as duplicates")
+        with st.expander("Advanced"):
+            chunk_rows = st.number_input("Rows per chunk", min_value=1000, max_value=100000, value=LEDGER_CHUNK_ROWS, step=1000)
+
+        if st.button("🚀 Analyze Workbook", use_container_width=True, disabled=not selected_sheets):
+            status = st.empty()
+
+            def progress(sheet_name, rows_done):
+                status.write(f"Analyzing **{sheet_name}**: {rows_done:,} rows read")
+
+            started = time.perf_counter()
+            try:
+                st.session_state.ledger_results = profile_excel_workbook(
+                    uploaded_file, selected_sheets, key_columns, int(chunk_rows), progress
+                )
+                st.session_state.ledger_file_name = uploaded_file.name
+                status.success(f"Analyzed {uploaded_file.name} in {time.perf_counter() - started:,.1f}s")
+            except Exception as e:
+                status.error(f"Error analyzing workbook: {str(e)}")
+
+    results = st.session_state.get('ledger_results')
+    if results:
+        profile_rows = []
+        duplicate_rows = []
+        outlier_rows = []
+        for sheet_name, sheet in results.items():
+            st.markdown(f'<h2>📄 {sheet_name}</h2>', unsafe_allow_html=True)
+
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.markdown(f'<div class="stats-card"><h3>{sheet["rows"]:,}</h3><p>Rows</p></div>', unsafe_allow_html=True)
+            with col2:
+                st.markdown(f'<div class="stats-card"><h3>{len(sheet["columns"])}</h3><p>Columns</p></div>', unsafe_allow_html=True)
+            with col3:
+                st.markdown(f'<div class="stats-card"><h3>{sheet["duplicate_rows"]:,}</h3><p>Duplicate Rows</p></div>', unsafe_allow_html=True)
+            with col4:
+                outlier_count = sum(c['estimated_outliers'] or 0 for c in sheet['columns'])
+                st.markdown(f'<div class="stats-card"><h3>~{outlier_count:,}</h3><p>Outliers</p></div>', unsafe_allow_html=True)
+
+            st.subheader("Column Profile")
+            st.dataframe(pd.DataFrame(sheet['columns']), use_container_width=True)
+
+            if sheet['key_columns']:
+                st.subheader(f"Duplicate Keys ({', '.join(sheet['key_columns'])})")
+                if sheet['duplicates']:
+                    st.dataframe(pd.DataFrame(sheet['duplicates']), use_container_width=True)
+                    if len(sheet['duplicates']) >= LEDGER_MAX_DUPLICATE_KEYS:
+                        st.caption(f"Showing the first {LEDGER_MAX_DUPLICATE_KEYS} duplicated keys")
+                else:
+                    st.write("No duplicate keys found.")
+
+            if sheet['outliers']:
+                st.subheader("Largest Outliers")
+                st.dataframe(pd.DataFrame(sheet['outliers']), use_container_width=True)
+
+            profile_rows.extend(dict(c, sheet=sheet_name, rows=sheet['rows']) for c in sheet['columns'])
+            duplicate_rows.extend(dict(d, sheet=sheet_name) for d in sheet['duplicates'])
+            outlier_rows.extend(dict(o, sheet=sheet_name) for o in sheet['outliers'])
+
+        # Export options
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        exports = [("Profile", "ledger_profile", profile_rows), ("Duplicate Keys", "ledger_duplicates", duplicate_rows),
+                   ("Outliers", "ledger_outliers", outlier_rows)]
+        exports = [export for export in exports if export[2]]
+        for col, (label, prefix, rows) in zip(st.columns(max(1, len(exports))), exports):
+            with col:
+                st.download_button(
+                    label=f"📥 Download {label} CSV",
+                    data=pd.DataFrame(rows).to_csv(index=False),
+                    file_name=f"{prefix}_{timestamp}.csv",
+                    mime="text/csv"
+                )
+
+        # Save to projects
+        if st.button("💾 Save to Projects"):
+            project_id = save_project(
+                st.session_state.user_id,
+                get_tool_id("Excel Ledger Analyzer"),
+                f"Ledger Profile - {st.session_state.ledger_file_name}",
+                f"Profiled {len(results)} sheets, {sum(sheet['rows'] for sheet in results.values()):,} rows",
+                results
+            )
+            st.success(f"Saved to projects with ID: {project_id}")
+
+    # Instructions
+    with st.expander("📋 Instructions"):
+        st.markdown("""
+        1. **Upload Workbook**: Select an XLSX ledger (the first row of each sheet is treated as headers)
+        2. **Choose Sheets and Keys**: Pick the sheets to analyze and, optionally, the columns that should be unique (e.g. voucher number)
+        3. **Analyze**: The workbook is streamed in chunks, so very large ledgers can be profiled
+        4. **Review**: Check column types, totals, duplicate keys and outliers, then export or save to your projects
+
+        Outlier counts are estimated from a random sample of each numeric column using 3×IQR fences.
+        """)
+
+def hash_generator_page():
+    st.markdown('<div class="main-header"><h1>#️⃣ Hash Generator</h1><p style="color: var(--text-secondary);">Generate and verify evidence hashes for client data</p></div>', unsafe_allow_html=True)
+    back_to_tools_button()
+
+    tab_generate, tab_verify = st.tabs(["Generate", "Verify"])
+
+    with tab_generate:
+        # File upload
+        st.markdown('<div class="upload-area">', unsafe_allow_html=True)
+        uploaded_files = st.file_uploader("Upload files to hash", accept_multiple_files=True, key="hash_files")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        algorithms = st.multiselect("Algorithms", HASH_ALGORITHMS, default=HASH_ALGORITHMS)
+        expand_zips = st.checkbox("Also hash each member of .zip archives", value=True)
+
+        if uploaded_files and algorithms and st.button("🚀 Generate Hashes", use_container_width=True):
+            progress_bar = st.progress(0.0)
+            started = time.perf_counter()
+            entries = hash_files(
+                [(file.name, file.getvalue()) for file in uploaded_files], algorithms, expand_zips,
+                lambda done, total: progress_bar.progress(done / total, text=f"Hashed {done} of {total}")
+            )
+            st.session_state.hash_entries = entries
+            st.session_state.hash_algorithms = algorithms
+            total_size = sum(entry['size'] or 0 for entry in entries)
+            st.success(f"Hashed {len(entries)} entries ({total_size / 1024 / 1024:,.1f} MB) in {time.perf_counter() - started:,.1f}s")
+
+        entries = st.session_state.get('hash_entries')
+        if entries:
+            manifest = pd.DataFrame(entries, columns=['name', 'size'] + st.session_state.hash_algorithms + ['error'])
+            manifest['size'] = manifest['size'].astype('Int64')
+            st.dataframe(manifest, use_container_width=True)
+
+            st.download_button(
+                label="📥 Download Hash Manifest",
+                data=manifest.to_csv(index=False),
+                file_name=f"hash_manifest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+
+            # Save to projects
+            if st.button("💾 Save to Projects"):
+                project_id = save_project(
+                    st.session_state.user_id,
+                    get_tool_id("Hash Generator"),
+                    f"Hash Manifest - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+                    f"Hashed {len(entries)} files and archive members",
+                    entries
+                )
+                st.success(f"Saved to projects with ID: {project_id}")
+
+    with tab_verify:
+        manifest_file = st.file_uploader("Upload hash manifest (CSV)", type=['csv'], key="hash_manifest")
+        verify_files = st.file_uploader("Upload the files to verify", accept_multiple_files=True, key="hash_verify_files")
+
+        if manifest_file and verify_files and st.button("🔍 Verify Files", use_container_width=True):
+            manifest = pd.read_csv(manifest_file, dtype=str)
+            if 'name' not in manifest.columns:
+                st.error("The manifest must have a 'name' column.")
+            else:
+                algorithms = [algorithm for algorithm in HASH_ALGORITHMS if algorithm in manifest.columns]
+                # Member entries are named "<archive>.zip/<member>"
+                expand_zips = any('/' in name and _is_zip_archive(name.split('/', 1)[0]) for name in manifest['name'].dropna())
+                entries = hash_files([(file.name, file.getvalue()) for file in verify_files], algorithms, expand_zips)
+                report = pd.DataFrame(verify_manifest(manifest, entries, algorithms))
+
+                matched = (report['status'] == 'Match').sum()
+                if matched == len(report):
+                    st.success(f"All {matched} entries match the manifest.")
+                else:
+                    st.error(f"{len(report) - matched} of {len(report)} entries do not match the manifest.")
+                st.dataframe(report, use_container_width=True)
+
+    # Instructions
+    with st.expander("📋 Instructions"):
+        st.markdown("""
+        1. **Generate**: Upload one or more files (ZIP archives can also be hashed member by member)
+        2. **Export**: Download the hash manifest as CSV or save it to your projects
+        3. **Verify**: Later, upload the manifest together with the same files to confirm nothing has changed
+
+        Each file is read once in 1 MB chunks and all selected algorithms are computed in that single pass.
+        """)
+
+def audit_sampling_page():
+    st.markdown('<div class="main-header"><h1>🎯 Audit Sampling</h1><p style="color: var(--text-secondary);">Reproducible statistical samples from large populations</p></div>', unsafe_allow_html=True)
+    back_to_tools_button()
+
+    # Population
+    source = st.radio("Population source", ["Upload CSV/XLSX", "Saved challan results"], horizontal=True)
+    if source == "Upload CSV/XLSX":
+        uploaded_file = st.file_uploader("Upload population", type=['csv', 'xlsx'])
+        if uploaded_file and st.button("📥 Load Population"):
+            try:
+                st.session_state.sampling_population = load_sampling_population(uploaded_file)
+                st.session_state.sampling_source = {
+                    'source': 'upload',
+                    'file_name': uploaded_file.name,
+                    'sha256': hashlib.sha256(uploaded_file.getvalue()).hexdigest(),
+                }
+            except Exception as e:
+                st.error(f"Error reading population: {str(e)}")
+    else:
+        challan_projects = [p for p in get_user_projects(st.session_state.user_id) if p[8] == "TDS Challan Extractor" and p[5]]
+        if not challan_projects:
+            st.info("No saved TDS Challan Extractor results yet.")
+        else:
+            labels = {f"{p[3]} (ID {p[0]})": p[0] for p in challan_projects}
+            selected = st.selectbox("Saved project", list(labels))
+            if st.button("📥 Load Population"):
+                st.session_state.sampling_population = get_project_frame(labels[selected])
+                st.session_state.sampling_source = {'source': 'project', 'project_id': labels[selected]}
+
+    population = st.session_state.get('sampling_population')
+    if population is None:
+        return
+    if population.empty:
+        st.warning("The population has no rows. Load a file or project with at least one item.")
+        del st.session_state['sampling_population']
+        return
+    st.write(f"**Population:** {len(population):,} items, {len(population.columns)} columns")
+
+    # Parameters
+    numeric_first = sorted(population.columns, key=lambda column: not pd.api.types.is_numeric_dtype(population[column]))
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        method = st.selectbox("Method", SAMPLING_METHODS)
+    with col2:
+        value_column = st.selectbox("Value column", numeric_first)
+    with col3:
+        seed = int(st.number_input("Random seed", min_value=0, value=12345, step=1))
+
+    amounts = sampling_amounts(population[value_column])
+    total_value = float(amounts.sum())
+    parameters = {'method': method, 'value_column': value_column, 'seed': seed}
+
+    if method == "Monetary Unit":
+        col1, col2 = st.columns(2)
+        with col1:
+            confidence = st.selectbox("Confidence level (%)", list(MUS_RELIABILITY_FACTORS), index=2)
+        with col2:
+            tolerable = st.number_input("Tolerable misstatement", min_value=1.0, value=max(1.0, round(total_value * 0.05, 2)))
+        sample_size = mus_sample_size(total_value, confidence, tolerable)
+        if sample_size > len(population):
+            st.warning(f"Computed sample size {sample_size:,} exceeds the population; capped at {len(population):,} items. Consider a larger tolerable misstatement.")
+            sample_size = len(population)
+        st.write(f"**Sample size:** {sample_size:,} (book value ₹{total_value:,.2f})")
+        parameters.update({'confidence': confidence, 'tolerable_misstatement': tolerable})
+    else:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            sample_size = int(st.number_input("Sample size", min_value=1, max_value=max(1, len(population)), value=min(60, max(1, len(population)))))
+        if method == "Stratified Random":
+            with col2:
+                strata_count = int(st.number_input("Number of strata", min_value=1, max_value=20, value=4))
+            with col3:
+                allocation = st.selectbox("Allocation", ["value", "count"])
+            parameters.update({'strata': strata_count, 'allocation': allocation})
+    parameters['sample_size'] = sample_size
+
+    if st.button("🎲 Select Sample", use_container_width=True):
+        started = time.perf_counter()
+        summary = None
+        if method == "Monetary Unit":
+            positions, hits, interval, start = monetary_unit_sample(amounts, sample_size, seed)
+            selection = population.iloc[positions].copy()
+            selection['hits'] = hits
+            parameters.update({'interval': interval, 'random_start': start})
+        elif method == "Stratified Random":
+            positions, strata, summary = stratified_random_sample(amounts, sample_size, strata_count, seed, allocation)
+            selection = population.iloc[positions].copy()
+            selection['stratum'] = strata
+        else:
+            positions, interval, start = systematic_sample(len(population), sample_size, seed)
+            selection = population.iloc[positions].copy()
+            parameters.update({'interval': interval, 'random_start': start})
+        selection.insert(0, 'population_row', positions + 1)
+        elapsed = time.perf_counter() - started
+
+        parameters['population'] = dict(st.session_state.sampling_source, rows=len(population), total_value=round(total_value, 2))
+        st.session_state.sampling_selection = selection.reset_index(drop=True)
+        st.session_state.sampling_summary = summary
+        st.session_state.sampling_parameters = parameters
+        st.success(f"Selected {len(selection):,} items from {len(population):,} in {elapsed * 1000:,.0f} ms")
+
+    selection = st.session_state.get('sampling_selection')
+    if selection is not None:
+        if st.session_state.sampling_summary:
+            st.subheader("Strata")
+            st.dataframe(pd.DataFrame(st.session_state.sampling_summary), use_container_width=True)
+
+        st.subheader("Selected Items")
+        render_paged_table(selection, "sampling_selection")
+
+        with st.expander("Sampling Parameters"):
+            st.json(st.session_state.sampling_parameters)
+
+        # Export options
+        st.download_button(
+            label="📥 Download Sample CSV",
+            data=selection.to_csv(index=False),
+            file_name=f"audit_sample_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+
+        # Save to projects
+        if st.button("💾 Save to Projects"):
+            parameters = st.session_state.sampling_parameters
+            project_id = save_project(
+                st.session_state.user_id,
+                get_tool_id("Audit Sampling"),
+                f"{parameters['method']} Sample - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+                f"Selected {len(selection):,} of {parameters['population']['rows']:,} items (seed {parameters['seed']})",
+                json.loads(selection.to_json(orient='records', date_format='iso')),
+                parameters=parameters
+            )
+            st.success(f"Saved to projects with ID: {project_id}")
+
+    # Instructions
+    with st.expander("📋 Instructions"):
+        st.markdown("""
+        1. **Population**: Upload a CSV/XLSX population or use saved TDS challan results
+        2. **Method**:
+           - **Monetary Unit**: sample size from confidence level and tolerable misstatement; items are selected by cumulative value with a random start
+           - **Stratified Random**: items are grouped into value bands and sampled at random within each band
+           - **Systematic**: every k-th item from a random start
+        3. **Select and Save**: The seed and all parameters are saved with the project so the sample can be re-performed
+        """)
+
 def projects_page():
     st.markdown('<div class="main-header"><h1>📁 Your Projects</h1><p style="color: var(--text-secondary);">Manage your audit projects and results</p></div>', unsafe_allow_html=True)
 
@@ -697,11 +1953,74 @@ def projects_page():
                     st.write(f"**Description:** {project[4] or 'No description'}")
                     st.write(f"**Status:** {project[6].title()}")
                     st.write(f"**Created:** {project[8]}")
+                    if project[10]:
+                        st.write("**Parameters:**")
+                        st.json(json.loads(project[10]), expanded=False)
                 with col2:
                     if project[5]:  # Results
                         if st.button(f"📊 View Results", key=f"view_{project[0]}"):
-                            results = json.loads(project[5])
-                            st.json(results)
+                            if st.session_state.get('viewing_project') != project[0]:
+                                st.session_state.pop('project_results_view', None)
+                            st.session_state.viewing_project = project[0]
+
+                if project[5] and st.session_state.get('viewing_project') == project[0]:
+                    df = get_project_frame(project[0])
+                    if df is not None:
+                        render_paged_table(df, f"project_{project[0]}", memo_key="project_results")
+                    else:
+                        # Non-tabular results (e.g. tool parameters) are small
+                        st.json(load_project_results(project[0]))
+
+def analytics_page():
+    st.markdown('<div class="main-header"><h1>📈 TDS Analytics</h1><p style="color: var(--text-secondary);">Challan totals across all saved projects</p></div>', unsafe_allow_html=True)
+
+    summary = get_tds_summary()
+    if summary.empty:
+        st.markdown('<div class="tool-card" style="text-align: center;"><h3>No challan data yet</h3><p style="color: var(--text-secondary);">Save TDS Challan Extractor results to see analytics here.</p></div>', unsafe_allow_html=True)
+        return
+
+    # Filters
+    col1, col2 = st.columns(2)
+    with col1:
+        years = sorted(summary['assessment_year'].unique(), reverse=True)
+        selected_year = st.selectbox("Assessment Year", ["All"] + years)
+    with col2:
+        tans = sorted(summary['tan'].unique())
+        selected_tans = st.multiselect("TAN", tans)
+
+    if selected_year != "All":
+        summary = summary[summary['assessment_year'] == selected_year]
+    if selected_tans:
+        summary = summary[summary['tan'].isin(selected_tans)]
+    if summary.empty:
+        st.info("No challans match the selected filters.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown(f'<div class="stats-card"><h3>{int(summary["challan_count"].sum())}</h3><p>Challans</p></div>', unsafe_allow_html=True)
+    with col2:
+        st.markdown(f'<div class="stats-card"><h3>₹{summary["tax"].sum():,.2f}</h3><p>Tax Deposited</p></div>', unsafe_allow_html=True)
+    with col3:
+        st.markdown(f'<div class="stats-card"><h3>{summary["tan"].nunique()}</h3><p>TANs</p></div>', unsafe_allow_html=True)
+
+    # Monthly tax per TAN
+    monthly = summary.groupby(['month', 'tan'], as_index=False)['tax'].sum().sort_values('month')
+    fig = px.bar(monthly, x='month', y='tax', color='tan', title="Monthly Tax Deposited per TAN",
+                 labels={'month': 'Month', 'tax': 'Tax (₹)', 'tan': 'TAN'})
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Nature of payment breakdown
+    by_nature = summary.groupby('nature_of_payment', as_index=False)[TDS_SUMMARY_AMOUNTS[1:]].sum()
+    by_nature = by_nature.melt(id_vars='nature_of_payment', var_name='component', value_name='value')
+    fig = px.bar(by_nature, x='nature_of_payment', y='value', color='component', title="Deposits by Nature of Payment",
+                 labels={'nature_of_payment': 'Nature of Payment', 'value': 'Amount (₹)', 'component': 'Component'})
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Totals table
+    st.subheader("Totals by TAN and Assessment Year")
+    totals = summary.groupby(['tan', 'assessment_year'], as_index=False)[['challan_count'] + TDS_SUMMARY_AMOUNTS].sum()
+    st.dataframe(totals, use_container_width=True)
 
 def profile_page():
     st.markdown('<div class="main-header"><h1>👤 Profile Settings</h1><p style="color: var(--text-secondary);">Manage your account settings and preferences</p></div>', unsafe_allow_html=True)
@@ -788,17 +2107,40 @@ def admin_page():
     df = pd.DataFrame(tools_data)
     st.dataframe(df, use_container_width=True)
 
+    # Results storage
+    st.subheader("🗜️ Results Storage")
+    storage_stats = get_results_storage_stats()
+    if storage_stats:
+        st.dataframe(pd.DataFrame(
+            [{'Format': fmt, 'Projects': count, 'Size (KB)': round(size / 1024, 1)} for fmt, count, size in storage_stats]
+        ), use_container_width=True)
+    else:
+        st.write("No saved results yet.")
+
+    legacy_count = sum(count for fmt, count, size in storage_stats if fmt == RESULTS_FORMAT_JSON)
+    if legacy_count:
+        st.write(f"**{legacy_count}** projects still store results as uncompressed JSON.")
+        if st.button("Compress Legacy Results"):
+            report = migrate_project_results()
+            saved = report['bytes_before'] - report['bytes_after']
+            ratio = report['bytes_before'] / report['bytes_after'] if report['bytes_after'] else 0
+            st.success(f"Converted {report['rows']} projects: {report['bytes_before'] / 1024:,.1f} KB → {report['bytes_after'] / 1024:,.1f} KB ({saved / 1024:,.1f} KB saved, {ratio:.1f}x smaller)")
+            st.write(f"**Load time:** {report['load_before'] * 1000:,.1f} ms → {report['load_after'] * 1000:,.1f} ms across all converted projects")
+
 # Check for tool detail page
 if 'selected_tool' in st.session_state and st.session_state.selected_tool:
     tool = st.session_state.selected_tool
     if tool[1] == "TDS Challan Extractor":
         tds_challan_extractor_page()
+    elif tool[1] == "Excel Ledger Analyzer":
+        excel_ledger_analyzer_page()
+    elif tool[1] == "Hash Generator":
+        hash_generator_page()
+    elif tool[1] == "Audit Sampling":
+        audit_sampling_page()
     else:
         st.markdown(f'<div class="main-header"><h1>{tool[4]} {tool[1]}</h1><p>{tool[2]}</p></div>', unsafe_allow_html=True)
         st.info("This tool is being prepared for launch. For now, please use the TDS Challan Extractor above.")
-        if st.button("← Back to Tools"):
-            st.session_state.page = 'tools'
-            del st.session_state.selected_tool
-            st.rerun()
+        back_to_tools_button()
 else:
     main()
\ No newline at end of file